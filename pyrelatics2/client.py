@@ -2,33 +2,58 @@ import json
 import os
 import sys
 from base64 import b64encode
+from binascii import b2a_base64
+from contextlib import contextmanager
 from datetime import datetime
 from datetime import timedelta
-from http.client import HTTPSConnection
+from datetime import timezone
+from hashlib import sha256
+from io import BytesIO
+from logging import DEBUG
 from logging import getLogger
+from mmap import ACCESS_READ
+from mmap import mmap
 from platform import machine
 from platform import platform
 from platform import python_version
 from pprint import pformat
+from re import compile as compile_regex
+from socket import getdefaulttimeout
 from tempfile import gettempdir
+from tempfile import mkstemp
+from threading import Lock
+from typing import Iterator
 from typing import TypeAlias
 from typing import TypedDict
 from typing import overload
 from uuid import UUID
+from zipfile import ZIP_DEFLATED
+from zipfile import ZIP_STORED
 from zipfile import ZipFile
 
 from suds.client import Client
 from suds.plugin import MessageContext
 from suds.plugin import MessagePlugin
-from suds.sax.document import Document
 from suds.sax.element import Element
 from suds.sudsobject import Object as SudsObject
 
 from .exceptions import TokenRequestError
 from .result_classes import ExportResult
 from .result_classes import ImportResult
+from .transport import CONNECTION_POOL
+from .transport import KeepAliveTransport
 from .version import __version__
 
+try:
+    from fcntl import LOCK_EX
+    from fcntl import LOCK_SH
+    from fcntl import flock
+except ImportError:  # Not available on Windows, the token cache is used without locking there
+    flock = None  # pylint: disable=C0103
+
+# Don't follow a symlink planted at the path of a token cache file. Not available on Windows
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
 log = getLogger(__name__)
 
 
@@ -42,21 +67,74 @@ class TokenData(TypedDict):
     token: str
     """The actual token"""
     expires_on: datetime
-    """Expire time of the token"""
+    """Expire time of the token, in UTC"""
 
 
 # Constants
 TOKEN_PATH = "/oauth2/token"
 IMPORT_BASENAME = "pyrelatics_webservice"
-SUPPORTED_EXTENSIONS = ["xlsx", "xlsm", "xlsb", "xls", "csv"]
+SUPPORTED_EXTENSIONS = frozenset({"xlsx", "xlsm", "xlsb", "xls", "csv"})
+# Ampersands that don't start a predefined XML entity. Like suds, the entities themselves are kept as given
+XML_BARE_AMPERSAND = compile_regex(r"&(?!(?:amp|lt|gt|quot|apos);)")
+XML_ATTRIBUTE_ENTITIES = str.maketrans({"<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"})
+# Files that are compressed already, these are stored in the zip file without compressing them again
+COMPRESSED_EXTENSIONS = frozenset(
+    {"7z", "docx", "gif", "gz", "jpeg", "jpg", "mp3", "mp4", "png", "pptx", "rar", "xlsb", "xlsm", "xlsx", "zip"}
+)
 
 USER_AGENT = (
     f"PyRelatics2/{__version__} "
     f"({platform()}; {machine()}; python-{python_version()}) "
-    f"{os.path.split(sys.modules['__main__'].__file__)[1]}"  # pylint: disable=E1101
+    f"{os.path.basename(sys.modules['__main__'].__file__)}"  # pylint: disable=E1101
 )
 
 
+def b64encode_buffer(buffer: bytes | bytearray | memoryview | mmap) -> str:
+    """
+    Base64 encode a buffer directly, without copying it into a bytes object first.
+
+    Args:
+        buffer: The buffer to encode, like a memoryview of a BytesIO or a memory mapped file.
+
+    Returns:
+        The base64 encoded content of the buffer.
+    """
+    return b2a_base64(buffer, newline=False).decode("ascii")
+
+
+def b64encode_file(file_path: str) -> str:
+    """
+    Base64 encode the content of a file. The file is memory mapped and encoded directly, instead of being read into a
+    bytes object first. The encoded result is still a single string, about 4/3 of the file size.
+
+    Args:
+        file_path: Path of the file to encode.
+
+    Returns:
+        The base64 encoded content of the file.
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""  # An empty file can't be memory mapped
+
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as file_map:
+            return b64encode_buffer(file_map)
+
+
+def escape_xml_attribute(value: object) -> str:
+    """
+    Escape a value for use in an XML attribute, the same way suds does. Values that aren't a string are converted
+    with str(), so None becomes "None".
+
+    Args:
+        value: The value to escape.
+
+    Returns:
+        The escaped value.
+    """
+    return XML_BARE_AMPERSAND.sub("&amp;", str(value)).translate(XML_ATTRIBUTE_ENTITIES)
+
+
 def is_valid_uuid(s: str) -> bool:
     """
     Check if the given string can be converted into a valid UUID.
@@ -81,16 +159,28 @@ class ClientCredential:
     Args:
         client_id : The OAuth2 client_id
         client_secret : The OAuth2 client_secret
+        token_cache_dir : Directory where the tokens are cached, so other processes using the same client_id can
+            reuse them instead of requesting a new token. The cache file is only readable by the current user.
+            Defaults to None, meaning tokens are only kept in memory.
     """
 
     client_id: str
     client_secret: str
     tokens: dict[str, TokenData]
+    token_cache_path: str | None
+    """Path of the file where tokens are cached between processes, None when not cached on disk"""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, token_cache_dir: str | None = None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.tokens = {}
+        self._basic_header = f"Basic {b64encode(f'{client_id}:{client_secret}'.encode('utf-8')).decode('utf-8')}"
+        self.token_cache_path = None
+
+        if token_cache_dir is not None:
+            cache_name = sha256(client_id.encode("utf-8")).hexdigest()
+            self.token_cache_path = os.path.join(token_cache_dir, f"pyrelatics2-{cache_name}.json")
+            self.tokens.update(self._read_token_cache())
 
     def get_token(self, hostname: str, force_refresh: bool = False, user_agent: str = USER_AGENT) -> str:
         """
@@ -106,11 +196,11 @@ class ClientCredential:
         Returns:
             str: Token for the given hostname
         """
-        if (
-            force_refresh is True
-            or hostname not in self.tokens
-            or (self.tokens[hostname]["expires_on"] - datetime.now()).seconds <= 300
-        ):
+        if force_refresh is False and self.token_cache_path is not None and self._token_expires(hostname):
+            # Another process might have retrieved a new token in the meanwhile
+            self.tokens.update(self._read_token_cache())
+
+        if force_refresh is True or self._token_expires(hostname):
             log.info("No previous token for %s, retrieving new token", hostname)
             self.retrieve_token(hostname, user_agent)
         else:
@@ -130,22 +220,21 @@ class ClientCredential:
             RuntimeError: When Relatics sends back an error response
             KeyError: When there is no token in the response from Relatics
         """
-        requested_on = datetime.now()
-        auth_credentials = b64encode(bytes(f"{self.client_id}:{self.client_secret}", "utf-8"))
+        requested_on = datetime.now(timezone.utc)
         payload = "grant_type=client_credentials"
         headers = {
-            "Authorization": f"Basic {auth_credentials.decode('utf-8')}",
+            "Authorization": self._basic_header,
             "Content-Type": "text/plain",
             "User-Agent": user_agent,
         }
 
-        conn = HTTPSConnection(hostname)
-        conn.request("POST", TOKEN_PATH, payload, headers)
-        res = conn.getresponse()
-        data = res.read()
+        _, data = CONNECTION_POOL.request(
+            "POST", f"https://{hostname}{TOKEN_PATH}", payload, headers, timeout=getdefaulttimeout()
+        )
         response = json.loads(data.decode("utf-8"))
 
-        log.debug("Response from %s: %s", TOKEN_PATH, pformat(response, indent=2))
+        if log.isEnabledFor(DEBUG):
+            log.debug("Response from %s: %s", TOKEN_PATH, pformat(response, indent=2))
 
         if "error" in response:
             # Known errors:
@@ -164,6 +253,113 @@ class ClientCredential:
             expires_on=requested_on + timedelta(seconds=response["expires_in"]),
         )
 
+        if self.token_cache_path is not None:
+            self._write_token_cache(hostname)
+
+    def _token_expires(self, hostname: str) -> bool:
+        """Check if there is no token for the hostname, or if it expires within 5 minutes"""
+        return (
+            hostname not in self.tokens
+            or (self.tokens[hostname]["expires_on"] - datetime.now(timezone.utc)).total_seconds() <= 300
+        )
+
+    @contextmanager
+    def _token_cache_lock(self, exclusive: bool) -> Iterator[None]:
+        """Lock the token cache against other processes, using a separate lock file since the cache is replaced"""
+        if flock is None:
+            yield
+            return
+
+        lock_fd = os.open(f"{self.token_cache_path}.lock", os.O_RDWR | os.O_CREAT | _O_NOFOLLOW, 0o600)
+        try:
+            flock(lock_fd, LOCK_EX if exclusive else LOCK_SH)
+            yield
+        finally:
+            os.close(lock_fd)  # Also releases the lock
+
+    def _read_token_cache(self) -> dict[str, TokenData]:
+        """Read the cached tokens from disk, returns an empty dict when there is no (valid) cache"""
+        try:
+            with self._token_cache_lock(exclusive=False):
+                return self._load_token_cache()
+        except OSError as exc:
+            log.warning("Could not lock token cache %s: %r", self.token_cache_path, exc)
+            return {}
+
+    def _load_token_cache(self) -> dict[str, TokenData]:
+        """Load the cached tokens from disk, without locking. Ignores a cache that is not private to the user"""
+        try:
+            cache_fd = os.open(self.token_cache_path, os.O_RDONLY | _O_NOFOLLOW)  # type: ignore
+            with open(cache_fd, encoding="utf-8") as cache_file:
+                if hasattr(os, "getuid"):  # Not available on Windows
+                    cache_stat = os.fstat(cache_fd)
+                    if cache_stat.st_uid != os.getuid() or cache_stat.st_mode & 0o177:
+                        log.warning("Ignoring token cache %s, not private to the user", self.token_cache_path)
+                        return {}
+                cached = json.load(cache_file)
+            return {
+                hostname: TokenData(
+                    token=entry["token"],
+                    expires_on=datetime.fromisoformat(entry["expires_on"]).astimezone(timezone.utc),
+                )
+                for hostname, entry in cached.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as exc:
+            log.warning("Ignoring unreadable token cache %s: %r", self.token_cache_path, exc)
+            return {}
+
+    def _write_token_cache(self, hostname: str) -> None:
+        """Write the token of the hostname to the cache on disk, keeping the cached tokens of other hostnames"""
+        temp_path = None
+        try:
+            with self._token_cache_lock(exclusive=True):
+                cached = self._load_token_cache()
+                cached[hostname] = self.tokens[hostname]
+                # Use a new file with an unpredictable name, only accessible by the user (mode 0o600)
+                temp_fd, temp_path = mkstemp(
+                    suffix=".tmp",
+                    prefix=f"{os.path.basename(self.token_cache_path)}.",  # type: ignore
+                    dir=os.path.dirname(self.token_cache_path),  # type: ignore
+                )
+                with open(temp_fd, "w", encoding="utf-8") as cache_file:
+                    json.dump(
+                        {
+                            cached_hostname: {"token": entry["token"], "expires_on": entry["expires_on"].isoformat()}
+                            for cached_hostname, entry in cached.items()
+                        },
+                        cache_file,
+                    )
+                os.replace(temp_path, self.token_cache_path)
+        except OSError as exc:
+            log.warning("Could not write token cache %s: %r", self.token_cache_path, exc)
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass  # Already replaced
+
+
+class RawReplyPlugin(MessagePlugin):  # pylint: disable=R0903
+    """
+    Plugin for Suds Client to keep the raw reply XML, and hand suds an empty reply instead. Used together with the
+    "retxml" option when the reply is parsed with ImportResult.from_xml(), so suds doesn't parse the reply as well.
+    Replies that might contain a SOAP fault are passed on to suds unchanged, so suds still raises the WebFault. So are
+    empty replies, which suds passes as an empty str on HTTP errors, so suds still raises its (status, reason) error.
+    """
+
+    def __init__(self):
+        self.reply: bytes | None = None
+
+    def received(self, context: MessageContext):
+        if not isinstance(context.reply, bytes) or not context.reply:
+            return
+
+        self.reply = context.reply
+        if b"Fault" not in context.reply:
+            context.reply = b""
+
 
 class AddParametersPlugin(MessagePlugin):  # pylint: disable=R0903
     """
@@ -179,35 +375,39 @@ class AddParametersPlugin(MessagePlugin):  # pylint: disable=R0903
 
     def marshalled(self, context: MessageContext):
         if self.parameters is not None:
+            operation = context.envelope.getChild("Body")[0]
+
             # Try to get "Parameters" element, or built when missing
-            try:
-                params = context.envelope.getChild("Body")[0].getChild("Parameters")[0]
-            except TypeError:
+            outer_params = operation.getChild("Parameters")
+            if outer_params is None:
                 log.info("Adding parameters to SOAP request")
-                root = context.envelope.getChild("Body")[0]
-                root_prefix = root.findPrefix("http://www.relatics.com/")
+                operation_prefix = operation.findPrefix("http://www.relatics.com/")
 
-                p_1 = Element("Parameters", parent=root)
-                p_1.setPrefix(root_prefix)
-                root.append(p_1)
+                outer_params = Element("Parameters", parent=operation)
+                outer_params.setPrefix(operation_prefix)
+                operation.append(outer_params)
 
-                p_2 = Element("Parameters", parent=p_1)
-                p_2.setPrefix(root_prefix)
-                p_1.append(p_2)
-
-                params = context.envelope.getChild("Body")[0].getChild("Parameters")[0]
+                params = Element("Parameters", parent=outer_params)
+                params.setPrefix(operation_prefix)
+                outer_params.append(params)
+            else:
+                params = outer_params[0]
 
             prefix = params.findPrefix("http://www.relatics.com/")
 
-            # Add the parameters
+            # Add the parameters at once
+            param_elements = []
             for param_name, param_value in self.parameters.items():
                 elem = Element("Parameter", parent=params)
                 elem.setPrefix(prefix)
                 elem.set(name="Name", value=param_name)
                 elem.set(name="Value", value=param_value)
-                params.append(elem)
+                param_elements.append(elem)
+            params.append(param_elements)
 
-        log.debug("Final SOAP envelope: \n%s", context.envelope.str())
+        # Only serialize the envelope when it is actually logged
+        if log.isEnabledFor(DEBUG):
+            log.debug("Final SOAP envelope: \n%s", context.envelope.str())
 
 
 class RelaticsWebservices:
@@ -250,6 +450,11 @@ class RelaticsWebservices:
         self.user_agent = user_agent
         self.keep_zip_file = False  # Optionally keep the created zipfile. For debugging purpose only
 
+        # Suds client, built on first use and reused for all calls, since building it fetches and parses the WSDL.
+        # Since the per request options are set on the client itself, a call holds the lock while using the client.
+        self._suds_client: Client | None = None
+        self._suds_client_lock = Lock()
+
     @property
     def wsdl_url(self) -> str:
         """Return the complete WSDL url"""
@@ -265,11 +470,41 @@ class RelaticsWebservices:
         """The full hostname in the form: {company_subdomain}.relaticsonline.com"""
         return f"{self.company_subdomain.lower()}.relaticsonline.com"
 
+    def _get_client(self) -> Client:
+        """
+        Get the suds client for the WSDL url, building it on first use or when the WSDL url has changed. Should only
+        be called while holding the _suds_client_lock.
+        """
+        if self._suds_client is None or self._suds_client.wsdl.url != self.wsdl_url:
+            self._suds_client = Client(self.wsdl_url, transport=KeepAliveTransport())
+
+        return self._suds_client
+
     @staticmethod
     def _check_operation_name(operation_name: str) -> None:
         if operation_name == "":
             raise ValueError("Supplied operation_name is empty.")
 
+    def _prepare_auth(
+        self, authentication: None | str | ClientCredential, headers: dict[str, str]
+    ) -> dict[str, dict[str, str]]:
+        """
+        Prepare the authentication of a call: add the Bearer token to the headers for OAuth2 client credentials, and
+        generate the "Authentication" parameter.
+
+        Args:
+            authentication : Authentication for the webservice, see get_result() and run_import()
+            headers : The headers of the call, updated in place
+
+        Returns:
+            dict[str, dict[str, str]] : The "Authentication" parameter of the call
+        """
+        # Add auth header for OAuth2 requests
+        if isinstance(authentication, ClientCredential):
+            headers["Authorization"] = f"Bearer {authentication.get_token(self.hostname)}"
+
+        return self._generate_auth_parameter(authentication)
+
     @staticmethod
     def _generate_auth_parameter(authentication: None | str | ClientCredential = None) -> dict[str, dict[str, str]]:
         if isinstance(authentication, str):
@@ -336,27 +571,25 @@ class RelaticsWebservices:
         self._check_operation_name(operation_name=operation_name)
 
         headers = {"User-Agent": self.user_agent}
-        client = Client(self.wsdl_url)
-
-        # Add parameter plugin to handle parameters, when those are set
-        if parameters is not None:
-            client.set_options(plugins=[AddParametersPlugin(parameters)])
-
-        # Add auth header for OAuth2 requests
-        if isinstance(authentication, ClientCredential):
-            headers["Authorization"] = f"Bearer {authentication.get_token(self.hostname)}"
-
-        client.set_options(headers=headers)
-
-        # Any parameters will be handled by the AddParametersPlugin, so don't pass them here
-        # GetResult(xs:string Operation, Identification Identification, Parameters Parameters,
-        #           Authentication Authentication)
-        suds_response = client.service.GetResult(
-            Operation=operation_name,
-            Identification=self.identification,
-            Parameters=None,
-            Authentication=self._generate_auth_parameter(authentication),
-        )
+        auth = self._prepare_auth(authentication, headers)
+
+        with self._suds_client_lock:
+            client = self._get_client()
+
+            # Add parameter plugin to handle parameters, when those are set. Always set all options, since the
+            # client is reused between calls
+            plugins = [] if parameters is None else [AddParametersPlugin(parameters)]
+            client.set_options(headers=headers, plugins=plugins, retxml=False)
+
+            # Any parameters will be handled by the AddParametersPlugin, so don't pass them here
+            # GetResult(xs:string Operation, Identification Identification, Parameters Parameters,
+            #           Authentication Authentication)
+            suds_response = client.service.GetResult(
+                Operation=operation_name,
+                Identification=self.identification,
+                Parameters=None,
+                Authentication=auth,
+            )
 
         if auto_parse_response:
             # Parse the raw response into something useful
@@ -367,56 +600,62 @@ class RelaticsWebservices:
         return export_result
 
     @staticmethod
-    def _generate_data_xml(data: list[dict[str, str]]) -> Document:
-        # Build data xml
-        root = Element("Import")
-        doc = Document(root)
-
-        for data_row in data:
-            row = Element("Row", parent=root)
-            for key, value in data_row.items():
-                row.set(name=key, value=value)
-            root.append(row)
+    def _generate_data_xml(data: list[dict[str, str]]) -> bytes:
+        # Build data xml. The schema is flat, so build it as a string instead of an element tree. Leave out the
+        # indentation, since it only adds to the size of the payload.
+        parts = ['<?xml version="1.0" encoding="UTF-8"?><Import>']
+        parts.extend(
+            "<Row" + "".join(f' {key}="{escape_xml_attribute(value)}"' for key, value in data_row.items()) + "/>"
+            for data_row in data
+        )
+        parts.append("</Import>")
 
-        return doc
+        return "".join(parts).encode("utf-8")
 
     @staticmethod
     def _generate_zip_b64(
-        prepared_data: str | Document,
+        prepared_data: str | bytes,
         documents: list[str],
         file_basename: str,
         file_extension: str,
         keep_zip_file: bool,
     ) -> str:
-        # Generate the full filename for the zip file
-        import_zip_path = os.path.join(gettempdir(), f"{file_basename}.zip")
+        def compress_type(file_path: str) -> int:
+            file_extension = os.path.splitext(file_path)[1][1:].lower()
+            return ZIP_STORED if file_extension in COMPRESSED_EXTENSIONS else ZIP_DEFLATED
 
-        # Create the zip file
-        with ZipFile(import_zip_path, "w") as import_zip:
+        # Create the zip file in memory, compressed with the fastest compression level
+        zip_buffer = BytesIO()
+        with ZipFile(zip_buffer, "w", compression=ZIP_DEFLATED, compresslevel=1) as import_zip:
             # Add all the supplied documents
             for document_path in documents:
-                archive_name = os.path.join("Documents", os.path.split(document_path)[1])
-                import_zip.write(filename=document_path, arcname=archive_name)
+                archive_name = os.path.join("Documents", os.path.basename(document_path))
+                import_zip.write(
+                    filename=document_path, arcname=archive_name, compress_type=compress_type(document_path)
+                )
 
             # Add the data file
-            if isinstance(prepared_data, Document):
-                import_zip.writestr(zinfo_or_arcname=f"{file_basename}.{file_extension}", data=prepared_data.str())
+            if isinstance(prepared_data, bytes):
+                import_zip.writestr(zinfo_or_arcname=f"{file_basename}.{file_extension}", data=prepared_data)
             elif isinstance(prepared_data, str):
-                import_zip.write(filename=prepared_data, arcname=os.path.split(prepared_data)[1])
-
-            # log.debug(f"Zip-file created {import_zip_path}: \n{pformat(import_zip.namelist(), indent=2)}")
-            log.debug("Zip-file created %s: \n%s", import_zip_path, pformat(import_zip.namelist(), indent=2))
+                import_zip.write(
+                    filename=prepared_data,
+                    arcname=os.path.basename(prepared_data),
+                    compress_type=compress_type(prepared_data),
+                )
 
-        # Cleanup references to the ZipFile
-        del import_zip
+            if log.isEnabledFor(DEBUG):
+                log.debug("Zip-file created: \n%s", pformat(import_zip.namelist(), indent=2))
 
         # Convert zipfile to base64
-        with open(import_zip_path, "rb") as import_zip_file:
-            data_str = b64encode(import_zip_file.read()).decode("utf-8")
+        data_str = b64encode_buffer(zip_buffer.getbuffer())
 
-        # Remove the zip file from disk
-        if not keep_zip_file:
-            os.remove(import_zip_path)
+        # Keep a copy of the zip file on disk
+        if keep_zip_file:
+            import_zip_path = os.path.join(gettempdir(), f"{file_basename}.zip")
+            with open(import_zip_path, "wb") as import_zip_file:
+                import_zip_file.write(zip_buffer.getbuffer())
+            log.debug("Zip-file kept at %s", import_zip_path)
 
         return data_str
 
@@ -506,14 +745,12 @@ class RelaticsWebservices:
             raise TypeError("Invalid type of data supplied.")
         if documents:
             # Detect duplicate names. Remove duplicate tails in the path with set(). Optimized with set comprehension.
-            if len({os.path.split(path)[1] for path in documents}) != len(documents):
+            if len({os.path.basename(path) for path in documents}) != len(documents):
                 raise ValueError("Duplicate filenames in document list.")
 
         headers = {"User-Agent": self.user_agent}
         file_extension = None
 
-        client = Client(self.wsdl_url)
-
         # Prepare the data part
         if isinstance(data, list):
             # Set appropriate filename
@@ -524,7 +761,7 @@ class RelaticsWebservices:
 
         else:
             # Set appropriate filename, based on the given filename in "data"
-            file_extension = os.path.splitext(data)[1][1:]
+            file_extension = os.path.splitext(data)[1][1:].lower()
 
             # Validate if given extensions is supported
             if file_extension not in SUPPORTED_EXTENSIONS:
@@ -537,7 +774,7 @@ class RelaticsWebservices:
             file_basename = f"{IMPORT_BASENAME}"
         else:
             # Clean any possible path from the filename and remove a possible extension
-            file_basename = os.path.splitext(os.path.split(file_name)[1])[0]
+            file_basename = os.path.splitext(os.path.basename(file_name))[0]
 
         # Choose how to create the base64 data: when document are supplied, create a zip; otherwise
         # use the file or xml data
@@ -557,33 +794,37 @@ class RelaticsWebservices:
         else:  # documents is None
             if isinstance(data, list):
                 # Convert previously generated xml to base64
-                data_str = b64encode(bytes(prepared_data.str(), "utf-8")).decode("utf-8")
+                data_str = b64encode(prepared_data).decode("utf-8")
 
             else:
                 # Convert supplied data file to base64
-                with open(data, "rb") as data_file:
-                    data_str = b64encode(data_file.read()).decode("utf-8")
-
-        # Add auth header for OAuth2 requests
-        if isinstance(authentication, ClientCredential):
-            headers["Authorization"] = f"Bearer {authentication.get_token(self.hostname)}"
-
-        client.set_options(headers=headers)
-
-        # Import(xs:string Operation, Identification Identification, Authentication Authentication, xs:string Filename,
-        #        xs:string Data)
-        suds_response = client.service.Import(
-            Operation=operation_name,
-            Identification=self.identification,
-            Authentication=self._generate_auth_parameter(authentication),
-            Filename=f"{file_basename}.{file_extension}",
-            Data=data_str,
-        )
+                data_str = b64encode_file(data)
+
+        auth = self._prepare_auth(authentication, headers)
+
+        with self._suds_client_lock:
+            client = self._get_client()
+
+            # When parsing the response, keep the raw XML instead of letting suds parse it and build a sudsobject.
+            # Always set all options, since the client is reused between calls
+            raw_reply = RawReplyPlugin()
+            plugins = [raw_reply] if auto_parse_response else []
+            client.set_options(headers=headers, plugins=plugins, retxml=auto_parse_response)
+
+            # Import(xs:string Operation, Identification Identification, Authentication Authentication,
+            #        xs:string Filename, xs:string Data)
+            suds_response = client.service.Import(
+                Operation=operation_name,
+                Identification=self.identification,
+                Authentication=auth,
+                Filename=f"{file_basename}.{file_extension}",
+                Data=data_str,
+            )
         # KNOWLEDGE: Convert sudsobject to dict: client.dict(sudsobject)
 
         if auto_parse_response:
-            # Parse the raw response into something useful
-            import_result = ImportResult.from_suds(suds_response)
+            # Parse the raw response XML into something useful
+            import_result = ImportResult.from_xml(raw_reply.reply)
         else:
             import_result = suds_response
 
@@ -1,12 +1,21 @@
-from base64 import b64decode
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import time as dt_time
 from datetime import timedelta
+from functools import lru_cache
 from io import BytesIO
 from logging import getLogger
+from re import compile as compile_regex
+from sys import intern
+from tempfile import TemporaryFile
+from typing import IO
+from typing import ClassVar
+from typing import Iterable
+from typing import Iterator
 from typing import Literal
 from typing import TypeAlias
+from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import iterparse
 from zipfile import ZipFile
 
 from colorama import Fore
@@ -14,20 +23,92 @@ from colorama import Style
 from suds.sax.text import Text
 from suds.sudsobject import Object as SudsObject
 
+# Prefer the SIMD accelerated decoder from pybase64 when installed, otherwise use the C decoder from the stdlib. Both
+# ignore non-alphabet characters, just like base64.b64decode() did.
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from binascii import a2b_base64 as _b64decode
+
 # Type aliases
 ImportMessageStatus: TypeAlias = Literal["Progress", "Comment", "Success", "Warning", "Error"]
 ImportElementActions: TypeAlias = Literal["Add", "Update"]
 
 log = getLogger(__name__)
 
+# Sentinel for attributes missing from a SudsObject, to tell them apart from attributes set to None
+_MISSING = object()
+
+# Color used for each import message status when printed
+_STATUS_FORE_COLOR: dict[str, str] = {
+    "Progress": Fore.BLUE,
+    "Comment": Fore.RESET,
+    "Success": Fore.GREEN,
+    "Warning": Fore.YELLOW,
+    "Error": Fore.RED,
+}
+# Colored and padded status, as used in the printed import messages
+_COLORED_STATUS: dict[str, str] = {
+    status: f"{color}{status:<8}{Fore.RESET}" for status, color in _STATUS_FORE_COLOR.items()
+}
+
+# Progress messages containing the current row, total rows imported or total time
+_PROGRESS_PATTERN = compile_regex(r"(Processing row :|Total rows imported:|Total time \(ms\):)\s*(\d+)\s*$")
+
+# Decoded documents are kept in memory up to this size (in bytes), beyond that they are written to a temporary file
+_DOCUMENTS_SPOOL_SIZE = 16 << 20
+# Number of base64 characters decoded at once. A multiple of the 76 character MIME line length and of a 4 char quantum
+_B64_CHUNK_SIZE = 76 * 4 * 4096
+
+
+def _b64_to_spool(text: str) -> IO[bytes]:
+    """
+    Decode base64 encoded text in chunks into an in-memory buffer or a temporary file, so a large payload never has to
+    exist as one contiguous bytes object next to the encoded text.
+
+    Args:
+        text : The base64 encoded text, may contain whitespace (like line breaks)
+
+    Returns:
+        IO[bytes] : Buffer or temporary file containing the decoded data, positioned at the start
+    """
+    # Pick the storage up front from the estimated decoded size (3 bytes per 4 characters). Both are seekable on every
+    # supported Python version, as needed by ZipFile, unlike SpooledTemporaryFile before Python 3.11.
+    if len(text) * 3 // 4 > _DOCUMENTS_SPOOL_SIZE:
+        spool: IO[bytes] = TemporaryFile()  # pylint: disable=R1732
+    else:
+        spool = BytesIO()
+    remainder = ""
+
+    for start in range(0, len(text), _B64_CHUNK_SIZE):
+        # Strip whitespace and only decode complete groups of 4 characters; carry the rest to the next chunk
+        chunk = remainder + "".join(text[start : start + _B64_CHUNK_SIZE].split())
+        usable = len(chunk) - len(chunk) % 4
+        spool.write(_b64decode(chunk[:usable]))
+        remainder = chunk[usable:]
+
+    # Any incomplete group left is invalid base64, let the decoder raise the appropriate error
+    if remainder:
+        spool.write(_b64decode(remainder))
 
-class BaseResult:  # pylint: disable=R0903
+    spool.seek(0)
+    return spool
+
+
+@lru_cache(maxsize=4096)
+def _parse_time(value: str) -> dt_time:
+    """Parse an ISO formatted time. Cached, because lots of import messages share the same time."""
+    return dt_time.fromisoformat(value)
+
+
+@dataclass(kw_only=True, slots=True, eq=False)
+class BaseResult:
     """
     Base class with commonalities for the ExportResult and ImportResult classes.
     """
 
-    has_error: bool = False
-    error_msg: str | None = None
+    has_error: bool = field(default=False, repr=False, compare=False)
+    error_msg: str | None = field(default=None, repr=False, compare=False)
 
     def handle_suds_response_errors(self, suds_response: SudsObject | None) -> None:
         """Handle processing of common error scenarios"""
@@ -36,13 +117,10 @@ class BaseResult:  # pylint: disable=R0903
             self.error_msg = ""
             log.warning("Empty response received from the export request. This indicates an undefined error.")
 
-        # elif suds_response.Export._Error:
-        if hasattr(suds_response, "Export"):
+        error = getattr(getattr(suds_response, "Export", _MISSING), "_Error", _MISSING)
+        if error is not _MISSING:
             self.has_error = True
-            if hasattr(suds_response.Export, "_Error"):
-                self.error_msg = str(suds_response.Export._Error)  # pylint: disable=W0212
-            else:
-                self.error_msg = ""
+            self.error_msg = str(error)
             log.info("Received an error response from the import request: %s", self.error_msg)
 
 
@@ -75,32 +153,26 @@ class ExportResult(BaseResult):
         result.handle_suds_response_errors(suds_response)
 
         # Handle possibly received documents
-        if (
-            hasattr(suds_response, "Report")
-            and hasattr(suds_response.Report, "Documents")
-            and isinstance(suds_response.Report.Documents, Text)
-        ):
-            result.has_error = False
-
+        report = getattr(suds_response, "Report", _MISSING)
+        documents = getattr(report, "Documents", _MISSING)
+        if isinstance(documents, Text):
             # The the base64 encoded contents as a zip file
             result.documents = {}
 
-            with ZipFile(BytesIO(b64decode(str(suds_response.Report.Documents))), "r") as docs_zip:
-                for zipped_file in docs_zip.filelist:
-                    result.documents[zipped_file.filename] = docs_zip.read(zipped_file.filename)
-
-            # Cleanup variable without further use
-            del docs_zip
-            if "zipped_file" in locals():
-                del zipped_file  # pylint: disable=W0631
+            with (
+                _b64_to_spool(documents) as docs_spool,
+                ZipFile(docs_spool, "r") as docs_zip,
+            ):
+                for zipped_file in docs_zip.infolist():
+                    result.documents[zipped_file.filename] = docs_zip.read(zipped_file)
 
-            # Delete the Document node from the sudsobject
-            del suds_response.Report.Documents
+            # Delete the Document node from the sudsobject, and the local reference, so the encoded text can be freed
+            del report.Documents, documents
 
         # Store the SudsObject inside the result
         result.data = suds_response
 
-        if not hasattr(suds_response, "Export") and not hasattr(suds_response, "Report"):
+        if report is _MISSING and getattr(suds_response, "Export", _MISSING) is _MISSING:
             result.has_error = True
             result.error_msg = repr(suds_response)
             log.warning("Unrecognized response received from the export request.")
@@ -111,23 +183,24 @@ class ExportResult(BaseResult):
         return not self.has_error
 
     def __str__(self) -> str:
-        result = ""
+        parts: list[str] = []
 
         if self.has_error:
-            result += f"ERROR: {self.error_msg}\n"
+            parts.append(f"ERROR: {self.error_msg}\n")
 
         if self.data:
-            result += "[Data]: \n"
-            result += str(self.data)
-            result += "\n"
+            parts.append("[Data]: \n")
+            parts.append(str(self.data))
+            parts.append("\n")
 
         if self.documents:
-            result += "[Documents]: \n"
-            result += Style.BRIGHT + "RelaticsFilename                              Size (bytes)\n" + Style.RESET_ALL
-            for key, value in self.documents.items():
-                result += f"{key:45} {len(value):>12}\n"
+            parts.append("[Documents]: \n")
+            parts.append(
+                Style.BRIGHT + "RelaticsFilename                              Size (bytes)\n" + Style.RESET_ALL
+            )
+            parts.extend(f"{key:45} {len(value):>12}\n" for key, value in self.documents.items())
 
-        return result
+        return "".join(parts)
 
 
 # pylint: enable=W0212
@@ -139,29 +212,36 @@ class ImportMessage:
     Data class for a message in the result of an import
     """
 
-    time: dt_time | str
+    time: dt_time | str | None
     status: ImportMessageStatus
     message: str
     row: int
 
-    status_fore_color = {
-        "Progress": Fore.BLUE,
-        "Comment": Fore.RESET,
-        "Success": Fore.GREEN,
-        "Warning": Fore.YELLOW,
-        "Error": Fore.RED,
-    }
+    status_fore_color: ClassVar[dict[str, str]] = _STATUS_FORE_COLOR
 
     def __post_init__(self):
         """
         Convert a date given as string into a date
         """
         if isinstance(self.time, str):
-            self.time = dt_time.fromisoformat(self.time)
+            self.time = _parse_time(self.time) if self.time else None
+
+    @classmethod
+    def _fast(cls, time: str | None, status: ImportMessageStatus, message: str, row: int) -> "ImportMessage":
+        """
+        Create an ImportMessage from positional values, skipping the keyword handling of the generated __init__.
+        Used for the bulk creation of messages when parsing an import response. The status is interned, so all
+        messages share the same few status strings. A missing time is kept as None.
+        """
+        instance = cls.__new__(cls)
+        instance.time = _parse_time(time) if time else None
+        instance.status = intern(str(status))
+        instance.message = message
+        instance.row = row
+        return instance
 
     def __str__(self) -> str:
-        status_color = self.status_fore_color[self.status]
-        return f"{self.time}  {self.row:05}  {status_color}{self.status:<8}{Fore.RESET}  {self.message}"
+        return f"{self.time}  {self.row:05}  {_COLORED_STATUS[self.status]}  {self.message}"
 
 
 @dataclass(kw_only=True, slots=True)
@@ -174,6 +254,19 @@ class ImportElement:
     id: str  # pylint: disable=invalid-name
     foreign_key: str
 
+    @classmethod
+    def _fast(cls, action: ImportElementActions, element_id: str, foreign_key: str) -> "ImportElement":
+        """
+        Create an ImportElement from positional values, skipping the keyword handling of the generated __init__.
+        Used for the bulk creation of elements when parsing an import response. The action is interned, so all
+        elements share the same two action strings.
+        """
+        instance = cls.__new__(cls)
+        instance.action = intern(str(action))
+        instance.id = element_id
+        instance.foreign_key = foreign_key
+        return instance
+
     def __str__(self) -> str:
         return f"{self.action:<6}  {self.id}  {self.foreign_key}"
 
@@ -209,72 +302,147 @@ class ImportResult(BaseResult):
         # Handle common errors
         result.handle_suds_response_errors(suds_response)
 
-        if hasattr(suds_response, "Import"):
-            result.has_error = False
-
+        import_node = getattr(suds_response, "Import", _MISSING)
+        if import_node is not _MISSING:
             # Add all the messages when available
-            if hasattr(suds_response.Import, "Message"):
-                row = 0
-                for msg in suds_response.Import.Message:
-                    # Monitor any row changes
-                    if msg._Result == "Progress":
-                        if "Processing row :" in msg.value:
-                            row = int(msg.value[17:])
-                        elif "Total rows imported:" in msg.value:
-                            result.total_rows = int(msg.value[21:])
-                        elif "Total time (ms):" in msg.value:
-                            result.elapsed_time = timedelta(milliseconds=int(msg.value[17:]))
-
-                    result.messages.append(
-                        ImportMessage(time=msg._Time, status=msg._Result, message=msg.value, row=row)
-                    )
+            messages = getattr(import_node, "Message", _MISSING)
+            if messages is not _MISSING:
+                # Force a single message into a list
+                messages = messages if isinstance(messages, list) else [messages]
+                result.messages.extend(
+                    result._parse_messages((getattr(msg, "_Time", None), msg._Result, msg.value) for msg in messages)
+                )
 
             # Add all the elements when available
-            if hasattr(suds_response.Import, "Elements") and len(suds_response.Import.Elements) > 0:
+            elements_node = getattr(import_node, "Elements", _MISSING)
+            if elements_node is not _MISSING and len(elements_node) > 0:
                 # Force a single element into a list and None into an empty list
-                _elements = suds_response.Import.Elements[0]
+                _elements = elements_node[0]
                 elements = _elements if isinstance(_elements, list) else [] if _elements is None else [_elements]
 
-                for elem in elements:
-                    result.elements.append(
-                        ImportElement(action=elem._Action, id=elem._ID, foreign_key=elem._ForeignKey)
-                    )
+                result.elements.extend(
+                    ImportElement._fast(elem._Action, elem._ID, elem._ForeignKey) for elem in elements
+                )
 
-        if not hasattr(suds_response, "Export") and not hasattr(suds_response, "Import"):
+        if import_node is _MISSING and getattr(suds_response, "Export", _MISSING) is _MISSING:
             result.has_error = True
             result.error_msg = repr(suds_response)
             log.warning("Unrecognized response received from the import request.")
 
         return result
 
+    @staticmethod
+    def from_xml(raw_response: bytes | None) -> "ImportResult":
+        """
+        Parse the raw SOAP response XML of the import request for messages and elements and respond with a filled
+        ImportResult object. Faster than from_suds() for large imports, since no <sudsobject> tree is built. The XML is
+        parsed incrementally, and every message and element is removed from the tree once processed.
+
+        Args:
+            raw_response : Raw SOAP response XML from the import request
+
+        Response:
+            ImportResult : Parsed result of the import.
+        """
+        result = ImportResult()
+
+        if not raw_response:
+            # Handle the same way as an empty <sudsobject> response
+            result.handle_suds_response_errors(None)
+            result.error_msg = repr(raw_response)
+            log.warning("Unrecognized response received from the import request.")
+            return result
+
+        found_import = found_export = False
+        raw_messages: list[tuple[str | None, str, str]] = []
+        # Ancestors of the current node, to remove the processed nodes from their parent
+        parents: list[Element] = []
+        for event, node in iterparse(BytesIO(raw_response), events=("start", "end")):
+            if event == "start":
+                parents.append(node)
+                continue
+            parents.pop()
+
+            # Ignore the namespaces, just like the <sudsobject> attributes
+            tag = node.tag.rpartition("}")[2]
+
+            if tag == "Message":
+                raw_messages.append((node.get("Time"), node.get("Result", ""), (node.text or "").strip()))
+                if parents:
+                    parents[-1].remove(node)
+            elif tag == "Element":
+                result.elements.append(
+                    ImportElement._fast(node.get("Action", ""), node.get("ID", ""), node.get("ForeignKey", ""))
+                )
+                if parents:
+                    parents[-1].remove(node)
+            elif tag == "Import":
+                found_import = True
+            elif tag == "Export":
+                found_export = True
+                if (error := node.get("Error")) is not None:
+                    result.has_error = True
+                    result.error_msg = error
+                    log.info("Received an error response from the import request: %s", result.error_msg)
+
+        result.messages.extend(result._parse_messages(raw_messages))
+
+        if not found_import and not found_export:
+            result.has_error = True
+            result.error_msg = repr(raw_response)
+            log.warning("Unrecognized response received from the import request.")
+
+        return result
+
+    def _parse_messages(self, raw_messages: Iterable[tuple[str | None, str, str]]) -> Iterator[ImportMessage]:
+        """
+        Create the messages from (time, status, message) tuples, while monitoring the progress messages for row
+        changes, the total rows imported and the total time.
+
+        Yields:
+            ImportMessage: The created messages
+        """
+        row = 0
+        for time, status, message in raw_messages:
+            if status == "Progress" and (progress := _PROGRESS_PATTERN.match(message)):
+                kind, number = progress.group(1), int(progress.group(2))
+                if kind == "Processing row :":
+                    row = number
+                elif kind == "Total rows imported:":
+                    self.total_rows = number
+                else:  # "Total time (ms):"
+                    self.elapsed_time = timedelta(milliseconds=number)
+
+            yield ImportMessage._fast(time, status, message, row)
+
     def __bool__(self) -> bool:
         return not self.has_error
 
     def __str__(self) -> str:
-        result = ""
+        parts: list[str] = []
 
         if self.has_error:
-            result += f"ERROR: {self.error_msg}\n"
+            parts.append(f"ERROR: {self.error_msg}\n")
 
         if self.total_rows is not None:
-            result += f"Rows imported : {self.total_rows}\n"
+            parts.append(f"Rows imported : {self.total_rows}\n")
 
         if self.elapsed_time is not None:
-            result += f"Elapsed time  : {self.elapsed_time} (h:mm:ss.mmmmmm)\n"
+            parts.append(f"Elapsed time  : {self.elapsed_time} (h:mm:ss.mmmmmm)\n")
 
         if self.messages:
-            result += "[Messages]: \n"
-            result += Style.BRIGHT + "Time      Row    Status    Message\n" + Style.RESET_ALL
-            for msg in self.messages:
-                result += f"{msg.__str__()} \n"
+            parts.append("[Messages]: \n")
+            parts.append(Style.BRIGHT + "Time      Row    Status    Message\n" + Style.RESET_ALL)
+            parts.extend(f"{msg} \n" for msg in self.messages)
 
         if self.elements:
-            result += "[Elements]: \n"
-            result += Style.BRIGHT + "Action  ID                                    Foreign key\n" + Style.RESET_ALL
-            for elem in self.elements:
-                result += f"{elem.__str__()} \n"
+            parts.append("[Elements]: \n")
+            parts.append(
+                Style.BRIGHT + "Action  ID                                    Foreign key\n" + Style.RESET_ALL
+            )
+            parts.extend(f"{elem} \n" for elem in self.elements)
 
-        return result
+        return "".join(parts)
 
     def filter_messages(self, status: ImportMessageStatus) -> list[ImportMessage]:
         """
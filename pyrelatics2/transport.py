@@ -0,0 +1,223 @@
+import os
+from gzip import compress as gzip_compress
+from gzip import decompress as gzip_decompress
+from http.client import OK
+from http.client import HTTPConnection
+from http.client import HTTPResponse
+from http.client import HTTPSConnection
+from io import BytesIO
+from logging import getLogger
+from select import select
+from threading import Lock
+from urllib.parse import urlsplit
+from urllib.request import Request as UrllibRequest
+from weakref import WeakSet
+from zlib import compress as zlib_compress
+from zlib import decompress as zlib_decompress
+
+from suds.transport import Reply
+from suds.transport import Request
+from suds.transport import TransportError
+from suds.transport.https import HttpAuthenticated
+
+log = getLogger(__name__)
+
+# Redirects that urllib follows for a POST request
+_REDIRECT_STATUSES = frozenset({301, 302, 303})
+
+
+class ConnectionPool:
+    """
+    Minimal pool of kept-alive HTTP(S) connections per host, so repeated requests to the same Relatics host don't need
+    a new TCP connection and TLS handshake each time. A connection is only used by one request at a time.
+
+    Args:
+        max_idle : Maximum number of idle connections kept per host
+    """
+
+    max_idle: int
+    """Maximum number of idle connections kept per host"""
+
+    def __init__(self, max_idle: int = 4):
+        self.max_idle = max_idle
+        self._idle: dict[tuple[str, str], list[HTTPConnection]] = {}
+        self._lock = Lock()
+        _POOLS.add(self)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | str | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> tuple[HTTPResponse, bytes]:
+        """
+        Send a request over an idle connection to the host of the url, or a new connection when none is available,
+        and read the complete response.
+
+        Args:
+            method : The HTTP method, like "POST"
+            url : The full url of the request
+            body : The body of the request
+            headers : The headers of the request
+            timeout : Timeout in seconds for blocking operations, None to block indefinitely
+
+        Returns:
+            tuple[HTTPResponse, bytes]: The response and its complete body
+        """
+        url_parts = urlsplit(url)
+        key = (url_parts.scheme, url_parts.netloc)
+        path = f"{url_parts.path or '/'}?{url_parts.query}" if url_parts.query else url_parts.path or "/"
+
+        connection = self._acquire(key, timeout)
+        try:
+            connection.request(method, path, body, headers or {})
+            response = connection.getresponse()
+            data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        return response, data
+
+    def clear(self) -> None:
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _after_fork(self) -> None:
+        """
+        Drop the idle connections inherited from the parent process, which still uses them. Only the file descriptors
+        of the child are closed, nothing is sent on the connections. The lock is replaced, since it might have been
+        held by another thread of the parent while forking.
+        """
+        self._lock = Lock()
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _acquire(self, key: tuple[str, str], timeout: float | None) -> HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection = idle.pop()
+                if not _is_dropped(connection):
+                    log.debug("Reusing connection to %s", key[1])
+                    connection.timeout = timeout
+                    connection.sock.settimeout(timeout)  # type: ignore
+                    return connection
+                connection.close()
+
+        log.debug("Opening new connection to %s", key[1])
+        connection_class = HTTPSConnection if key[0] == "https" else HTTPConnection
+        return connection_class(key[1], timeout=timeout)
+
+    def _release(self, key: tuple[str, str], connection: HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+
+def _is_dropped(connection: HTTPConnection) -> bool:
+    """
+    Check whether an idle connection was closed by the server. With no request pending, a readable socket means the
+    server has closed it (or sent something unexpected), either way it can't be reused.
+    """
+    if connection.sock is None:
+        return True
+
+    try:
+        readable, _, _ = select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+
+    return bool(readable)
+
+
+def _after_fork_in_child() -> None:
+    """Let every pool drop the connections it inherited, so the child never sends on a connection of the parent"""
+    for pool in list(_POOLS):
+        pool._after_fork()  # pylint: disable=W0212
+
+
+_POOLS: WeakSet[ConnectionPool] = WeakSet()
+if hasattr(os, "register_at_fork"):  # Not available on Windows, which doesn't fork
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+CONNECTION_POOL = ConnectionPool()
+"""Connection pool shared by the token requests and the SOAP requests"""
+
+
+class KeepAliveTransport(HttpAuthenticated):
+    """
+    Suds transport sending the SOAP requests over kept-alive connections from a ConnectionPool, instead of opening a
+    new connection for every request. Cookies and Content-Encoding are handled like the default suds transport.
+
+    Requests that need features of urllib are sent with the default suds transport instead: when a proxy is set in
+    the "proxy" option, when HTTP authentication is set with the "username" and "password" options, or when the
+    server responds with a redirect. Just like the default suds transport, proxies from the environment are not used.
+
+    Args:
+        pool : The connection pool to use. Defaults to CONNECTION_POOL.
+        kwargs : Options for the default suds transport
+    """
+
+    def __init__(self, pool: ConnectionPool | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.pool = pool if pool is not None else CONNECTION_POOL
+
+    def send(self, request: Request) -> Reply:
+        if urlsplit(request.url).scheme in self.options.proxy or None not in self.credentials():
+            return super().send(request)
+
+        message = request.message
+        encoding = request.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            message = gzip_compress(message)
+        elif encoding == "deflate":
+            message = zlib_compress(message)
+
+        # A urllib request, only to let the cookie jar add and extract the cookies
+        u2request = UrllibRequest(request.url, message, request.headers)
+        self.addcookies(u2request)
+        if (cookie := u2request.get_header("Cookie")) is not None:
+            request.headers["Cookie"] = cookie
+
+        log.debug("sending:\n%s", request)
+        response, message = self.pool.request(
+            "POST", request.url, message, request.headers, request.timeout or self.options.timeout
+        )
+        self.getcookies(response, u2request)
+
+        if response.status in _REDIRECT_STATUSES:
+            # Let urllib follow the redirect, the server didn't process the request
+            return super().send(request)
+
+        encoding = response.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            message = gzip_decompress(message)
+        elif encoding == "deflate":
+            message = zlib_decompress(message)
+
+        if not 200 <= response.status < 300:
+            # Pass the body on, so suds can report the SOAP fault of a 500 response
+            raise TransportError(response.reason, response.status, BytesIO(message))
+
+        reply = Reply(OK, response.headers, message)
+        log.debug("received:\n%s", reply)
+        return reply
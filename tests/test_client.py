@@ -3,13 +3,25 @@ Testing the "client.py" module
 """
 import os
 import unittest
+from base64 import b64encode
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest import mock
 from uuid import UUID
 
+from parameterized import parameterized
+from suds.plugin import PluginContainer
+
 from pyrelatics2.client import USER_AGENT
+from pyrelatics2.client import ClientCredential
+from pyrelatics2.client import RawReplyPlugin
 from pyrelatics2.client import RelaticsWebservices
-
-# from parameterized import parameterized
-
+from pyrelatics2.client import TokenData
+from pyrelatics2.client import b64encode_buffer
+from pyrelatics2.client import b64encode_file
 
 # pylint: disable=missing-class-docstring,missing-function-docstring,line-too-long,too-few-public-methods
 
@@ -101,6 +113,13 @@ class TestRelaticsWebservices(unittest.TestCase):
             )
         self.assertEqual(str(context.exception), "Supplied data is empty.")
 
+    def test_run_import_exception_unsupported_extension(self):
+        with self.assertRaises(TypeError) as context:
+            RelaticsWebservices("Python", "fb8267ee-8032-4557-8062-c48d5fd4ff9a").run_import(
+                "ascertain-pang-unripe", "tributary-maturely-recoil.txt"
+            )
+        self.assertEqual(str(context.exception), "Supplied file has unsupported file extension.")
+
     def test_run_import_exception_documents_duplicates(self):
         filename = "frequent-rehab-scary.jpg"
 
@@ -112,6 +131,329 @@ class TestRelaticsWebservices(unittest.TestCase):
             )
         self.assertEqual(str(context.exception), "Duplicate filenames in document list.")
 
+    def test_prepare_auth_client_credential(self):
+        # Arrange
+        instance = RelaticsWebservices("Python", "fb8267ee-8032-4557-8062-c48d5fd4ff9a")
+        headers = {"User-Agent": USER_AGENT}
+
+        client_credential = ClientCredential("client_id", "client_secret")
+
+        # Act
+        with mock.patch.object(ClientCredential, "get_token", return_value="token123") as get_token:
+            auth = instance._prepare_auth(client_credential, headers)  # pylint: disable=W0212
+
+        # Assert
+        get_token.assert_called_once_with("python.relaticsonline.com")
+        self.assertEqual(headers, {"User-Agent": USER_AGENT, "Authorization": "Bearer token123"})
+        self.assertEqual(auth, {"Authentication": {}})
+
+    def test_prepare_auth_entry_code(self):
+        # Arrange
+        instance = RelaticsWebservices("Python", "fb8267ee-8032-4557-8062-c48d5fd4ff9a")
+        headers = {"User-Agent": USER_AGENT}
+
+        # Act
+        auth = instance._prepare_auth("entry-code", headers)  # pylint: disable=W0212
+
+        # Assert
+        self.assertEqual(headers, {"User-Agent": USER_AGENT})
+        self.assertEqual(auth, {"Authentication": {"Entrycode": "entry-code"}})
+
+    def test_generate_data_xml(self):
+        # Arrange
+        data = [{"name": "A & B", "description": '"quoted" <tag>'}, {}]
+
+        # Act
+        result = RelaticsWebservices._generate_data_xml(data)  # pylint: disable=W0212
+
+        # Assert
+        self.assertEqual(
+            result,
+            b'<?xml version="1.0" encoding="UTF-8"?><Import>'
+            b'<Row name="A &amp; B" description="&quot;quoted&quot; &lt;tag&gt;"/><Row/></Import>',
+        )
+
+    def test_generate_data_xml_like_suds(self):
+        # Arrange
+        data = [{"number": 5, "empty": None, "entity": "A &amp; B &lt;tag&gt;", "char_ref": "&#38;", "quote": "it's"}]
+
+        # Act
+        result = RelaticsWebservices._generate_data_xml(data)  # pylint: disable=W0212
+
+        # Assert
+        self.assertEqual(
+            result,
+            b'<?xml version="1.0" encoding="UTF-8"?><Import>'
+            b'<Row number="5" empty="None" entity="A &amp; B &lt;tag&gt;" char_ref="&amp;#38;" quote="it&apos;s"/>'
+            b"</Import>",
+        )
+
+    def test_run_import_reuses_client_and_token(self):
+        # Arrange
+        instance = RelaticsWebservices("Python", "fb8267ee-8032-4557-8062-c48d5fd4ff9a")
+        client_credential = ClientCredential("client_id", "client_secret")
+        token_response = (mock.Mock(), b'{"access_token": "token123", "expires_in": 3600}')
+        jobs = [
+            {"operation_name": "first-operation", "data": [{"name": "A"}]},
+            {"operation_name": "second-operation", "data": [{"name": "B"}]},
+        ]
+
+        # Act
+        with mock.patch("pyrelatics2.client.Client") as client_class:
+            client_class.return_value.wsdl.url = instance.wsdl_url
+            client_class.return_value.service.Import.side_effect = ["first", "second"]
+            with mock.patch(
+                "pyrelatics2.client.CONNECTION_POOL.request", return_value=token_response
+            ) as token_request:
+                results = [
+                    instance.run_import(**job, authentication=client_credential, auto_parse_response=False)
+                    for job in jobs
+                ]
+
+        # Assert
+        self.assertEqual(results, ["first", "second"])
+        client_class.assert_called_once()  # One suds client, so one transport using the same kept-alive connection
+        token_request.assert_called_once()
+        import_calls = client_class.return_value.service.Import.call_args_list
+        self.assertEqual([_.kwargs["Operation"] for _ in import_calls], ["first-operation", "second-operation"])
+        for set_options in client_class.return_value.set_options.call_args_list:
+            self.assertEqual(set_options.kwargs["headers"]["Authorization"], "Bearer token123")
+
+
+class TestRawReplyPlugin(unittest.TestCase):
+    def test_received(self):
+        # Arrange
+        plugin = RawReplyPlugin()
+        context = mock.Mock(reply=b"<Envelope><Body><ImportResponse /></Body></Envelope>")
+
+        # Act
+        plugin.received(context)
+
+        # Assert
+        self.assertEqual(plugin.reply, b"<Envelope><Body><ImportResponse /></Body></Envelope>", "wrong reply")
+        self.assertEqual(context.reply, b"", "reply passed on to suds")
+
+    def test_received_fault(self):
+        # Arrange
+        plugin = RawReplyPlugin()
+        context = mock.Mock(reply=b"<Envelope><Body><Fault /></Body></Envelope>")
+
+        # Act
+        plugin.received(context)
+
+        # Assert
+        self.assertEqual(plugin.reply, b"<Envelope><Body><Fault /></Body></Envelope>", "wrong reply")
+        self.assertEqual(context.reply, b"<Envelope><Body><Fault /></Body></Envelope>", "fault not passed on to suds")
+
+    def test_received_empty(self):
+        # Arrange: suds passes an empty str as reply for HTTP errors without a body
+        plugin = RawReplyPlugin()
+        container = PluginContainer([plugin])
+
+        # Act
+        context = container.message.received(reply="")
+
+        # Assert
+        self.assertIsNone(plugin.reply, "wrong reply")
+        self.assertEqual(context.reply, "", "empty reply not passed on to suds")
+
+
+class TestClientCredential(unittest.TestCase):
+    token_response = (mock.Mock(), b'{"access_token": "token123", "expires_in": 3600}')
+
+    def test_get_token_reuse(self):
+        # Arrange
+        instance = ClientCredential("client_id", "client_secret")
+        instance.tokens["python.relaticsonline.com"] = TokenData(
+            token="token123", expires_on=datetime.now(timezone.utc) + timedelta(hours=1)
+        )
+
+        # Act
+        with mock.patch("pyrelatics2.client.CONNECTION_POOL.request") as request:
+            token = instance.get_token("python.relaticsonline.com")
+
+        # Assert
+        self.assertEqual(token, "token123")
+        request.assert_not_called()
+
+    def test_get_token_expired(self):
+        # Arrange
+        instance = ClientCredential("client_id", "client_secret")
+        instance.tokens["python.relaticsonline.com"] = TokenData(
+            token="expired", expires_on=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+
+        # Act
+        with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response) as request:
+            token = instance.get_token("python.relaticsonline.com")
+
+        # Assert
+        self.assertEqual(token, "token123")
+        request.assert_called_once()
+
+    def test_get_token_cache_dir(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            first = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response):
+                first.get_token("python.relaticsonline.com")
+
+            # Act
+            second = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request") as request:
+                token = second.get_token("python.relaticsonline.com")
+
+        # Assert
+        self.assertEqual(token, "token123")
+        request.assert_not_called()
+
+    def test_get_token_cache_dir_missing(self):
+        # Arrange
+        with TemporaryDirectory() as temp_dir:
+            cache_dir = os.path.join(temp_dir, "missing")
+            with self.assertLogs("pyrelatics2.client", "WARNING"):
+                instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+            # Act
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response) as request:
+                with self.assertLogs("pyrelatics2.client", "WARNING"):
+                    token = instance.get_token("python.relaticsonline.com")
+
+        # Assert
+        self.assertEqual(token, "token123")
+        request.assert_called_once()
+
+    @unittest.skipIf(os.name != "posix" or os.geteuid() == 0, "directory permissions are not enforced")
+    def test_get_token_cache_dir_read_only(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            os.chmod(cache_dir, 0o500)
+            try:
+                with self.assertLogs("pyrelatics2.client", "WARNING"):
+                    instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+                # Act
+                with mock.patch(
+                    "pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response
+                ) as request:
+                    with self.assertLogs("pyrelatics2.client", "WARNING"):
+                        token = instance.get_token("python.relaticsonline.com")
+            finally:
+                os.chmod(cache_dir, 0o700)
+
+        # Assert
+        self.assertEqual(token, "token123")
+        request.assert_called_once()
+
+    def test_get_token_cache_write_failed(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+            # Act
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response):
+                with mock.patch("pyrelatics2.client.os.replace", side_effect=PermissionError("denied")):
+                    with self.assertLogs("pyrelatics2.client", "WARNING"):
+                        token = instance.get_token("python.relaticsonline.com")
+            remaining = sorted(name for name in os.listdir(cache_dir) if not name.endswith(".lock"))
+
+        # Assert
+        self.assertEqual(token, "token123")
+        self.assertEqual(remaining, [], "temp file not removed")
+
+    def test_init_cache_dir_invalid_cache(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+            with open(instance.token_cache_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write("invalid")
+            os.chmod(instance.token_cache_path, 0o600)
+
+            # Act
+            with self.assertLogs("pyrelatics2.client", level="WARNING"):
+                instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+        # Assert
+        self.assertEqual(instance.tokens, {})
+
+    @unittest.skipIf(os.name != "posix", "file permissions are not enforced")
+    def test_get_token_cache_file_private(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+            # Act
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response):
+                instance.get_token("python.relaticsonline.com")
+            mode = os.stat(instance.token_cache_path).st_mode & 0o777
+            remaining = sorted(os.listdir(cache_dir))
+
+        # Assert
+        self.assertEqual(mode, 0o600, "cache file not private")
+        cache_name = os.path.basename(instance.token_cache_path)
+        self.assertEqual(remaining, [cache_name, f"{cache_name}.lock"], "temp file not replaced")
+
+    @unittest.skipIf(os.name != "posix", "file permissions are not enforced")
+    def test_init_cache_dir_not_private(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            first = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response):
+                first.get_token("python.relaticsonline.com")
+            os.chmod(first.token_cache_path, 0o644)
+
+            # Act
+            with self.assertLogs("pyrelatics2.client", level="WARNING"):
+                instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+        # Assert
+        self.assertEqual(instance.tokens, {})
+
+    @unittest.skipIf(os.name != "posix", "symlinks are not followed")
+    def test_init_cache_dir_symlink(self):
+        # Arrange
+        with TemporaryDirectory() as cache_dir:
+            first = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+            with mock.patch("pyrelatics2.client.CONNECTION_POOL.request", return_value=self.token_response):
+                first.get_token("python.relaticsonline.com")
+            target_path = os.path.join(cache_dir, "target.json")
+            os.replace(first.token_cache_path, target_path)
+            os.symlink(target_path, first.token_cache_path)
+
+            # Act
+            with self.assertLogs("pyrelatics2.client", level="WARNING"):
+                instance = ClientCredential("client_id", "client_secret", token_cache_dir=cache_dir)
+
+        # Assert
+        self.assertEqual(instance.tokens, {})
+
+
+class TestB64Encode(unittest.TestCase):
+    @parameterized.expand([("empty", 0), ("short", 10), ("long", (3 << 20) + 1)])
+    def test_b64encode_buffer(self, _, size):
+        # Arrange
+        data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+
+        # Act
+        result = b64encode_buffer(BytesIO(data).getbuffer())
+
+        # Assert
+        self.assertEqual(result, b64encode(data).decode("ascii"))
+
+    @parameterized.expand([("empty", b""), ("short", b"Lorem ipsum dolor sit amet.")])
+    def test_b64encode_file(self, _, data):
+        # Arrange
+        with TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "data.csv")
+            with open(file_path, "wb") as file:
+                file.write(data)
+
+            # Act
+            result = b64encode_file(file_path)
+
+        # Assert
+        self.assertEqual(result, b64encode(data).decode("ascii"))
+
 
 if __name__ == "__main__":
     # unittest.main()
@@ -3,9 +3,18 @@ Testing the "result_classes.py" module
 """
 import logging
 import unittest
+from base64 import encodebytes
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+from xml.etree.ElementTree import iterparse
+from zipfile import ZipFile
 
 from parameterized import parameterized
+from suds.sax.text import Text
+from suds.sudsobject import Factory
 
+from pyrelatics2.result_classes import BaseResult
 from pyrelatics2.result_classes import ExportResult
 from pyrelatics2.result_classes import ImportElement
 from pyrelatics2.result_classes import ImportElementActions
@@ -36,6 +45,75 @@ class TestExportResult(unittest.TestCase):
         self.assertEqual(repr(instance), "ExportResult(data=None, documents={})", "wrong __repr__()")
         self.assertEqual(str(instance), "ERROR: None\n", "wrong __str__()")
 
+    def test_from_suds_error(self):
+        # Arrange
+        suds_response = Factory.object("GetResultResult")
+        suds_response.Export = Factory.object("Export")
+        suds_response.Export._Error = Text("Operation not found.")  # pylint: disable=protected-access
+
+        # Act
+        instance = ExportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertFalse(instance, "wrong __bool__()")
+        self.assertEqual(instance.error_msg, "Operation not found.", "wrong error_msg")
+        self.assertEqual(instance.documents, {}, "wrong documents")
+
+    def test_from_suds_export_without_error(self):
+        # Arrange
+        suds_response = Factory.object("GetResultResult")
+        suds_response.Export = Factory.object("Export")
+
+        # Act
+        instance = ExportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertTrue(instance, "wrong __bool__()")
+        self.assertIsNone(instance.error_msg, "wrong error_msg")
+
+    def test_from_suds_documents(self):
+        # Arrange
+        documents = {"Documents/first.txt": b"wither-gecko-rundown" * 1000, "Documents/second.bin": bytes(range(256))}
+        docs_zip_buffer = BytesIO()
+        with ZipFile(docs_zip_buffer, "w") as docs_zip:
+            for name, content in documents.items():
+                docs_zip.writestr(name, content)
+
+        report = Factory.object("Report")
+        # Use encodebytes(), to include the line breaks of the 76 char MIME line length
+        report.Documents = Text(encodebytes(docs_zip_buffer.getvalue()).decode("ascii"))
+        suds_response = Factory.object("GetResultResult")
+        suds_response.Report = report
+
+        # Act
+        instance = ExportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertTrue(instance, "wrong __bool__()")
+        self.assertEqual(instance.documents, documents, "wrong documents")
+        self.assertFalse(hasattr(instance.data.Report, "Documents"), "Documents node not removed")
+
+    def test_from_suds_documents_on_disk(self):
+        # Arrange
+        documents = {"Documents/first.txt": b"wither-gecko-rundown" * 1000}
+        docs_zip_buffer = BytesIO()
+        with ZipFile(docs_zip_buffer, "w") as docs_zip:
+            for name, content in documents.items():
+                docs_zip.writestr(name, content)
+
+        report = Factory.object("Report")
+        report.Documents = Text(encodebytes(docs_zip_buffer.getvalue()).decode("ascii"))
+        suds_response = Factory.object("GetResultResult")
+        suds_response.Report = report
+
+        # Act: lower the in-memory limit, so the decoded documents are written to a temporary file
+        with mock.patch("pyrelatics2.result_classes._DOCUMENTS_SPOOL_SIZE", 0):
+            instance = ExportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertTrue(instance, "wrong __bool__()")
+        self.assertEqual(instance.documents, documents, "wrong documents")
+
 
 class TestImportResult(unittest.TestCase):
     def test_from_suds_none(self):
@@ -53,6 +131,343 @@ class TestImportResult(unittest.TestCase):
         )
         self.assertEqual(str(instance), "ERROR: None\n", "wrong __str__()")
 
+    def test_from_suds_error(self):
+        # Arrange
+        suds_response = Factory.object("ImportResult")
+        suds_response.Export = Factory.object("Export")
+        suds_response.Export._Error = Text("Import not found.")  # pylint: disable=protected-access
+
+        # Act
+        instance = ImportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertFalse(instance, "wrong __bool__()")
+        self.assertEqual(instance.error_msg, "Import not found.", "wrong error_msg")
+        self.assertEqual(str(instance), "ERROR: Import not found.\n", "wrong __str__()")
+
+    def test_from_suds(self):
+        # Arrange
+        messages = []
+        for time, status, value in [
+            ("13:17:54", "Progress", "Successfully created ImportLog."),
+            ("13:17:54", "Progress", "Processing row : 1"),
+            ("13:17:55", "Success", "Created element."),
+            ("13:17:55", "Progress", "Processing row : 2"),
+            ("13:17:55", "Warning", "Updated element."),
+            ("13:17:56", "Progress", "Total rows imported: 2"),
+            ("13:17:56", "Progress", "Total time (ms): 1234"),
+        ]:
+            message = Factory.object("Message")
+            message._Time = Text(time)  # pylint: disable=protected-access
+            message._Result = Text(status)  # pylint: disable=protected-access
+            message.value = Text(value)
+            messages.append(message)
+
+        element_list = []
+        for action, guid, foreign_key in [
+            ("Add", "4ed6d088-e236-4b6b-8cc6-aa0327e7b402", "1"),
+            ("Update", "4e4d7f01-c881-4666-b078-9e5ec05e53ad", "2"),
+        ]:
+            element = Factory.object("Element")
+            element._Action = Text(action)  # pylint: disable=protected-access
+            element._ID = Text(guid)  # pylint: disable=protected-access
+            element._ForeignKey = Text(foreign_key)  # pylint: disable=protected-access
+            element_list.append(element)
+        elements = Factory.object("Elements")
+        elements.Element = element_list
+
+        suds_response = Factory.object("ImportResult")
+        suds_response.Import = Factory.object("Import")
+        suds_response.Import.Message = messages
+        suds_response.Import.Elements = elements
+
+        # Act
+        instance = ImportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertTrue(instance, "wrong __bool__()")
+        self.assertEqual(instance.total_rows, 2, "wrong total_rows")
+        self.assertEqual(instance.elapsed_time, timedelta(milliseconds=1234), "wrong elapsed_time")
+        self.assertEqual(
+            [(str(_.time), _.status, _.message, _.row) for _ in instance.messages],
+            [
+                ("13:17:54", "Progress", "Successfully created ImportLog.", 0),
+                ("13:17:54", "Progress", "Processing row : 1", 1),
+                ("13:17:55", "Success", "Created element.", 1),
+                ("13:17:55", "Progress", "Processing row : 2", 2),
+                ("13:17:55", "Warning", "Updated element.", 2),
+                ("13:17:56", "Progress", "Total rows imported: 2", 2),
+                ("13:17:56", "Progress", "Total time (ms): 1234", 2),
+            ],
+            "wrong messages",
+        )
+        self.assertEqual(
+            instance.elements,
+            [
+                ImportElement(action="Add", id="4ed6d088-e236-4b6b-8cc6-aa0327e7b402", foreign_key="1"),
+                ImportElement(action="Update", id="4e4d7f01-c881-4666-b078-9e5ec05e53ad", foreign_key="2"),
+            ],
+            "wrong elements",
+        )
+
+    def test_from_suds_single_message(self):
+        # Arrange
+        message = Factory.object("Message")
+        message._Time = Text("13:17:54")  # pylint: disable=protected-access
+        message._Result = Text("Error")  # pylint: disable=protected-access
+        message.value = Text("Import failed.")
+
+        suds_response = Factory.object("ImportResult")
+        suds_response.Import = Factory.object("Import")
+        suds_response.Import.Message = message
+
+        # Act
+        instance = ImportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertEqual(
+            [(str(_.time), _.status, _.message, _.row) for _ in instance.messages],
+            [("13:17:54", "Error", "Import failed.", 0)],
+            "wrong messages",
+        )
+
+    def test_from_suds_missing_time(self):
+        # Arrange
+        message = Factory.object("Message")
+        message._Result = Text("Error")  # pylint: disable=protected-access
+        message.value = Text("Import failed.")
+
+        suds_response = Factory.object("ImportResult")
+        suds_response.Import = Factory.object("Import")
+        suds_response.Import.Message = message
+
+        # Act
+        instance = ImportResult.from_suds(suds_response)
+
+        # Assert
+        self.assertEqual(
+            [(_.time, _.status, _.message, _.row) for _ in instance.messages],
+            [(None, "Error", "Import failed.", 0)],
+            "wrong messages",
+        )
+
+    def test_from_xml(self):
+        # Arrange
+        raw_response = (
+            b'<?xml version="1.0" encoding="utf-8"?>'
+            b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            b"<soap:Body>"
+            b'<ImportResponse xmlns="http://www.relatics.com/">'
+            b"<ImportResult>"
+            b"<Import>"
+            b'<Message Time="13:17:54" Result="Progress">Successfully created ImportLog.</Message>'
+            b'<Message Time="13:17:54" Result="Progress">Processing row : 1</Message>'
+            b'<Message Time="13:17:55" Result="Success">Created element.</Message>'
+            b'<Message Time="13:17:56" Result="Progress">Total rows imported: 1</Message>'
+            b'<Message Time="13:17:56" Result="Progress">Total time (ms): 1234</Message>'
+            b"<Elements>"
+            b'<Element Action="Add" ID="4ed6d088-e236-4b6b-8cc6-aa0327e7b402" ForeignKey="1" />'
+            b"</Elements>"
+            b"</Import>"
+            b"</ImportResult>"
+            b"</ImportResponse>"
+            b"</soap:Body>"
+            b"</soap:Envelope>"
+        )
+
+        # Act
+        instance = ImportResult.from_xml(raw_response)
+
+        # Assert
+        self.assertTrue(instance, "wrong __bool__()")
+        self.assertEqual(instance.total_rows, 1, "wrong total_rows")
+        self.assertEqual(instance.elapsed_time, timedelta(milliseconds=1234), "wrong elapsed_time")
+        self.assertEqual(
+            [(str(_.time), _.status, _.message, _.row) for _ in instance.messages],
+            [
+                ("13:17:54", "Progress", "Successfully created ImportLog.", 0),
+                ("13:17:54", "Progress", "Processing row : 1", 1),
+                ("13:17:55", "Success", "Created element.", 1),
+                ("13:17:56", "Progress", "Total rows imported: 1", 1),
+                ("13:17:56", "Progress", "Total time (ms): 1234", 1),
+            ],
+            "wrong messages",
+        )
+        self.assertEqual(
+            instance.elements,
+            [ImportElement(action="Add", id="4ed6d088-e236-4b6b-8cc6-aa0327e7b402", foreign_key="1")],
+            "wrong elements",
+        )
+
+    def test_from_xml_missing_time(self):
+        # Arrange
+        raw_response = (
+            b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            b'<soap:Body><ImportResponse xmlns="http://www.relatics.com/"><ImportResult><Import>'
+            b'<Message Result="Error">Import failed.</Message>'
+            b"</Import></ImportResult></ImportResponse></soap:Body>"
+            b"</soap:Envelope>"
+        )
+
+        # Act
+        instance = ImportResult.from_xml(raw_response)
+
+        # Assert
+        self.assertEqual(
+            [(_.time, _.status, _.message, _.row) for _ in instance.messages],
+            [(None, "Error", "Import failed.", 0)],
+            "wrong messages",
+        )
+
+    def test_from_xml_removes_processed_nodes(self):
+        # Arrange
+        raw_response = (
+            b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            b'<soap:Body><ImportResponse xmlns="http://www.relatics.com/"><ImportResult><Import>'
+            b'<Message Time="13:17:54" Result="Progress">Processing row : 1</Message>'
+            b'<Message Time="13:17:55" Result="Success">Created element.</Message>'
+            b'<Elements><Element Action="Add" ID="4ed6d088-e236-4b6b-8cc6-aa0327e7b402" ForeignKey="1" /></Elements>'
+            b"</Import></ImportResult></ImportResponse></soap:Body>"
+            b"</soap:Envelope>"
+        )
+        nodes = []
+
+        def recording_iterparse(*args, **kwargs):
+            for event, node in iterparse(*args, **kwargs):
+                nodes.append(node)
+                yield event, node
+
+        # Act
+        with mock.patch("pyrelatics2.result_classes.iterparse", recording_iterparse):
+            instance = ImportResult.from_xml(raw_response)
+
+        # Assert
+        self.assertEqual(len(instance.messages), 2, "wrong messages")
+        self.assertEqual(len(instance.elements), 1, "wrong elements")
+        import_node = nodes[0].find(".//{http://www.relatics.com/}Import")
+        self.assertEqual([_.tag for _ in import_node], ["{http://www.relatics.com/}Elements"], "messages not removed")
+        self.assertEqual(len(import_node[0]), 0, "elements not removed")
+
+    def test_from_xml_error(self):
+        # Arrange
+        raw_response = (
+            b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            b'<soap:Body><ImportResponse xmlns="http://www.relatics.com/"><ImportResult>'
+            b'<Export Error="Import not found." />'
+            b"</ImportResult></ImportResponse></soap:Body>"
+            b"</soap:Envelope>"
+        )
+
+        # Act
+        instance = ImportResult.from_xml(raw_response)
+
+        # Assert
+        self.assertFalse(instance, "wrong __bool__()")
+        self.assertEqual(instance.error_msg, "Import not found.", "wrong error_msg")
+
+    def test_from_xml_none(self):
+        # Arrange
+        # Act
+        instance = ImportResult.from_xml(None)
+
+        # Assert
+        self.assertFalse(instance, "wrong __bool__()")
+        self.assertEqual(str(instance), "ERROR: None\n", "wrong __str__()")
+
+    def test_str(self):
+        # Arrange
+        instance = ImportResult(
+            messages=[
+                ImportMessage(time="13:17:54", status="Progress", message="Processing row : 1", row=1),
+                ImportMessage(time="13:17:55", status="Success", message="Created element.", row=1),
+            ],
+            elements=[ImportElement(action="Add", id="4ed6d088-e236-4b6b-8cc6-aa0327e7b402", foreign_key="1")],
+            total_rows=1,
+        )
+
+        # Act
+        # determine_output_helper(instance)  # Handy way to find current results
+
+        # Assert
+        self.assertEqual(
+            str(instance),
+            "Rows imported : 1\n"
+            "[Messages]: \n"
+            "\x1b[1mTime      Row    Status    Message\n\x1b[0m"
+            "13:17:54  00001  \x1b[34mProgress\x1b[39m  Processing row : 1 \n"
+            "13:17:55  00001  \x1b[32mSuccess \x1b[39m  Created element. \n"
+            "[Elements]: \n"
+            "\x1b[1mAction  ID                                    Foreign key\n\x1b[0m"
+            "Add     4ed6d088-e236-4b6b-8cc6-aa0327e7b402  1 \n",
+            "wrong __str__()",
+        )
+
+    def test_eq_ignores_error(self):
+        # Arrange
+        # Act
+        with_error = ImportResult(has_error=True, error_msg="Failed")
+        without_error = ImportResult()
+
+        # Assert
+        self.assertEqual(with_error, without_error, "error fields should not be compared")
+        self.assertNotEqual(BaseResult(), BaseResult(), "BaseResult should compare by identity")
+
+    def test_filter(self):
+        # Arrange
+        progress = ImportMessage(time="13:17:54", status="Progress", message="Processing row : 1", row=1)
+        success = ImportMessage(time="13:17:55", status="Success", message="Created element.", row=1)
+        added = ImportElement(action="Add", id="4ed6d088-e236-4b6b-8cc6-aa0327e7b402", foreign_key="1")
+        instance = ImportResult(messages=[progress, success], elements=[added])
+
+        # Act & Assert
+        self.assertEqual(instance.progress_messages, [progress], "wrong progress_messages")
+        self.assertEqual(instance.success_messages, [success], "wrong success_messages")
+        self.assertEqual(instance.error_messages, [], "wrong error_messages")
+        self.assertEqual(instance.added_elements, [added], "wrong added_elements")
+        self.assertEqual(instance.updated_elements, [], "wrong updated_elements")
+
+        # Messages and elements added afterwards are included as well
+        error = ImportMessage(time="13:17:56", status="Error", message="Failed to create element.", row=2)
+        updated = ImportElement(action="Update", id="4e4d7f01-c881-4666-b078-9e5ec05e53ad", foreign_key="2")
+        instance.messages.append(error)
+        instance.elements.append(updated)
+
+        self.assertEqual(instance.error_messages, [error], "wrong error_messages after append")
+        self.assertEqual(instance.updated_elements, [updated], "wrong updated_elements after append")
+
+    def test_filter_after_change(self):
+        # Arrange
+        progress = ImportMessage(time="13:17:54", status="Progress", message="Processing row : 1", row=1)
+        warning = ImportMessage(time="13:17:55", status="Warning", message="Empty value.", row=1)
+        error = ImportMessage(time="13:17:56", status="Error", message="Failed to create element.", row=1)
+        added = ImportElement(action="Add", id="4ed6d088-e236-4b6b-8cc6-aa0327e7b402", foreign_key="1")
+        updated = ImportElement(action="Update", id="4e4d7f01-c881-4666-b078-9e5ec05e53ad", foreign_key="2")
+        instance = ImportResult(messages=[progress, warning], elements=[added])
+        self.assertEqual(instance.warning_messages, [warning], "wrong warning_messages")
+        self.assertEqual(instance.added_elements, [added], "wrong added_elements")
+
+        # Act & Assert: replace an item
+        instance.messages[1] = error
+        instance.elements[0] = updated
+        self.assertEqual(instance.warning_messages, [], "wrong warning_messages after replace")
+        self.assertEqual(instance.error_messages, [error], "wrong error_messages after replace")
+        self.assertEqual(instance.added_elements, [], "wrong added_elements after replace")
+        self.assertEqual(instance.updated_elements, [updated], "wrong updated_elements after replace")
+
+        # Act & Assert: assign a list with the same length
+        instance.messages = [progress, warning]
+        instance.elements = [added]
+        self.assertEqual(instance.warning_messages, [warning], "wrong warning_messages after assign")
+        self.assertEqual(instance.error_messages, [], "wrong error_messages after assign")
+        self.assertEqual(instance.added_elements, [added], "wrong added_elements after assign")
+
+        # Act & Assert: change the status and action of an item
+        warning.status = "Error"
+        added.action = "Update"
+        self.assertEqual(instance.warning_messages, [], "wrong warning_messages after status change")
+        self.assertEqual(instance.error_messages, [warning], "wrong error_messages after status change")
+        self.assertEqual(instance.updated_elements, [added], "wrong updated_elements after action change")
+
 
 class TestImportMessage(unittest.TestCase):
     @parameterized.expand(
@@ -89,6 +504,29 @@ class TestImportMessage(unittest.TestCase):
         self.assertEqual(repr(instance), expected_repr, "wrong __repr__()")
         self.assertEqual(str(instance), expected_str, "wrong __str__()")
 
+    def test_status_fore_color(self):
+        # Arrange
+        # Act
+        instance = ImportMessage(time="13:17:54", status="Warning", message="Empty value.", row=1)
+
+        # Assert
+        self.assertEqual(ImportMessage.status_fore_color["Warning"], "\x1b[33m", "wrong class status_fore_color")
+        self.assertEqual(instance.status_fore_color["Error"], "\x1b[31m", "wrong instance status_fore_color")
+
+    def test_str_after_change(self):
+        # Arrange
+        instance = ImportMessage(time="13:17:54", status="Progress", message="Processing row : 1", row=1)
+        str(instance)
+
+        # Act
+        instance.status = "Error"
+        instance.message = "Failed to create element."
+
+        # Assert
+        self.assertEqual(
+            str(instance), "13:17:54  00001  \x1b[31mError   \x1b[39m  Failed to create element.", "wrong __str__()"
+        )
+
 
 class TestImportElement(unittest.TestCase):
     @parameterized.expand(
@@ -0,0 +1,233 @@
+"""
+Testing the "transport.py" module
+"""
+import os
+import unittest
+from gzip import compress as gzip_compress
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Thread
+from time import sleep
+from unittest import mock
+
+from suds.transport import Reply
+from suds.transport import Request
+from suds.transport import TransportError
+from suds.transport.https import HttpAuthenticated
+
+from pyrelatics2.transport import ConnectionPool
+from pyrelatics2.transport import KeepAliveTransport
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,line-too-long,too-few-public-methods
+
+
+class PeerEchoHandler(BaseHTTPRequestHandler):
+    """
+    Responds with the port of the client, to see which connection was used. The path selects special responses:
+    "/close" closes the connection after the response, "/cookie" sets a cookie and echoes the received cookie,
+    "/fault" responds with a 500, "/accepted" with a 202 without body, "/gzip" with a gzip encoded body and
+    "/redirect" with a 302.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # pylint: disable=C0103
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = str(self.client_address[1]).encode()
+        status = {"/fault": 500, "/accepted": 202, "/redirect": 302}.get(self.path, 200)
+        if self.path == "/fault":
+            body = b"<Fault>" + body + b"</Fault>"
+        elif self.path == "/accepted":
+            body = b""
+
+        self.send_response(status)
+        if self.path == "/cookie":
+            self.send_header("Set-Cookie", "session=abc; Path=/")
+            self.send_header("X-Cookie", self.headers.get("Cookie", ""))
+        elif self.path == "/gzip":
+            body = gzip_compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        elif self.path == "/redirect":
+            self.send_header("Location", "/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        # Close without announcing it, like a server dropping an idle connection
+        self.close_connection = self.path == "/close"
+
+    def log_message(self, *args):  # pylint: disable=W0221
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PeerEchoHandler)
+        Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/token"
+        self.pool = ConnectionPool()
+
+    def tearDown(self):
+        self.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_request_reuses_connection(self):
+        # Arrange
+        # Act
+        _, first = self.pool.request("POST", self.url, b"a", timeout=5)
+        response, second = self.pool.request("POST", self.url, b"b", timeout=5)
+
+        # Assert
+        self.assertEqual(response.status, 200)
+        self.assertEqual(first, second)
+
+    def test_request_after_clear(self):
+        # Arrange
+        _, first = self.pool.request("POST", self.url, b"a", timeout=5)
+
+        # Act
+        self.pool.clear()
+        _, second = self.pool.request("POST", self.url, b"b", timeout=5)
+
+        # Assert
+        self.assertNotEqual(first, second)
+
+    @unittest.skipIf(not hasattr(os, "fork"), "fork is not available")
+    def test_request_after_fork(self):
+        # Arrange
+        _, first = self.pool.request("POST", self.url, b"a", timeout=5)
+
+        # Act: the child must not reuse the connection of the parent
+        child_pid = os.fork()
+        if child_pid == 0:
+            try:
+                _, child = self.pool.request("POST", self.url, b"b", timeout=5)
+                os._exit(0 if child != first else 1)  # pylint: disable=W0212
+            except BaseException:  # pylint: disable=W0718
+                os._exit(2)  # pylint: disable=W0212
+        _, exit_status = os.waitpid(child_pid, 0)
+        _, second = self.pool.request("POST", self.url, b"c", timeout=5)
+
+        # Assert
+        self.assertEqual(os.waitstatus_to_exitcode(exit_status), 0, "connection of the parent reused in the child")
+        self.assertEqual(first, second, "connection of the parent not kept")
+
+
+class TestKeepAliveTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PeerEchoHandler)
+        Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.pool = ConnectionPool()
+        self.transport = KeepAliveTransport(pool=self.pool, timeout=5)
+
+    def tearDown(self):
+        self.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def send(self, path: str) -> Reply:
+        request = Request(f"{self.base_url}{path}", b"<Envelope/>")
+        request.headers = {"Content-Type": "text/xml; charset=utf-8", "SOAPAction": b"action"}
+        return self.transport.send(request)
+
+    def test_send_reuses_connection(self):
+        # Arrange
+        # Act
+        first = self.send("/")
+        second = self.send("/")
+
+        # Assert
+        self.assertEqual(first.code, 200)
+        self.assertEqual(first.message, second.message)
+
+    def test_send_dropped_connection(self):
+        # Arrange
+        first = self.send("/close")
+        sleep(0.1)  # Give the close by the server time to arrive
+
+        # Act
+        second = self.send("/")
+        third = self.send("/")
+
+        # Assert
+        self.assertNotEqual(first.message, second.message)
+        self.assertEqual(second.message, third.message)
+
+    def test_send_cookies(self):
+        # Arrange
+        first = self.send("/cookie")
+
+        # Act
+        second = self.send("/cookie")
+
+        # Assert
+        self.assertEqual(first.headers["X-Cookie"], "")
+        self.assertEqual(second.headers["X-Cookie"], "session=abc")
+
+    def test_send_fault(self):
+        # Arrange
+        # Act
+        with self.assertRaises(TransportError) as context:
+            self.send("/fault")
+
+        # Assert
+        self.assertEqual(context.exception.httpcode, 500)
+        self.assertTrue(context.exception.fp.read().startswith(b"<Fault>"))
+
+    def test_send_accepted(self):
+        # Arrange
+        # Act
+        reply = self.send("/accepted")
+
+        # Assert
+        self.assertEqual(reply.code, 200)
+        self.assertEqual(reply.message, b"")
+
+    def test_send_gzip(self):
+        # Arrange
+        # Act
+        reply = self.send("/gzip")
+
+        # Assert
+        self.assertTrue(reply.message.isdigit())
+
+    def test_send_redirect(self):
+        # Arrange
+        # Act
+        with mock.patch.object(HttpAuthenticated, "send", return_value="default") as default_send:
+            reply = self.send("/redirect")
+
+        # Assert
+        self.assertEqual(reply, "default")
+        default_send.assert_called_once()
+
+    def test_send_proxy(self):
+        # Arrange
+        self.transport.options.proxy = {"http": "proxy.example.com:8080"}
+
+        # Act
+        with mock.patch.object(HttpAuthenticated, "send", return_value="default") as default_send:
+            reply = self.send("/")
+
+        # Assert
+        self.assertEqual(reply, "default")
+        default_send.assert_called_once()
+
+    def test_send_credentials(self):
+        # Arrange
+        self.transport.options.username = "username"
+        self.transport.options.password = "password"
+
+        # Act
+        with mock.patch.object(HttpAuthenticated, "send", return_value="default") as default_send:
+            reply = self.send("/")
+
+        # Assert
+        self.assertEqual(reply, "default")
+        default_send.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()